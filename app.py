@@ -1,6 +1,12 @@
-from ui.gradio_app import create_app
+import logging
 
 if __name__ == "__main__":
+    # configure logging before importing the UI: importing it loads the model,
+    # and the detector package itself only installs a NullHandler
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    from ui.gradio_app import create_app
+
     app = create_app()
     app.launch(
         server_name="0.0.0.0",
@@ -0,0 +1,4 @@
+import logging
+
+# library-style logging: silent unless the app configures a handler
+logging.getLogger(__name__).addHandler(logging.NullHandler())
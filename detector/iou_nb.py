@@ -0,0 +1,60 @@
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # fall back to the NumPy version in pipeline.py
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+
+        return wrap
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def compute_iou(box1, area1, box2, area2):
+    """
+    Compute IoU between two boxes [x1, y1, x2, y2] with known areas.
+    """
+    inter_w = min(box1[2], box2[2]) - max(box1[0], box2[0])
+    inter_h = min(box1[3], box2[3]) - max(box1[1], box2[1])
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+
+    inter_area = inter_w * inter_h
+    return inter_area / (area1 + area2 - inter_area + 1e-6)
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def detect_accident(curr_coords, curr_areas, prev_coords, prev_areas, iou_thres, growth_thres):
+    """
+    True if any current box overlaps a previous box by at least iou_thres
+    and grew by at least growth_thres. Stops at the first hit.
+    """
+    for i in range(curr_coords.shape[0]):
+        for j in range(prev_coords.shape[0]):
+            if prev_areas[j] <= 0:
+                continue
+            # cheap rejections first: boxes that don't overlap, then too little growth
+            if (
+                curr_coords[i, 2] <= prev_coords[j, 0]
+                or curr_coords[i, 0] >= prev_coords[j, 2]
+                or curr_coords[i, 3] <= prev_coords[j, 1]
+                or curr_coords[i, 1] >= prev_coords[j, 3]
+            ):
+                continue
+            if curr_areas[i] / (prev_areas[j] + 1e-6) < growth_thres:
+                continue
+            if compute_iou(curr_coords[i], curr_areas[i], prev_coords[j], prev_areas[j]) >= iou_thres:
+                return True
+    return False
+
+
+if NUMBA_AVAILABLE:
+    # compile now so the first real frame doesn't pay for it
+    _boxes = np.zeros((1, 4), dtype=np.float32)
+    _areas = np.zeros((1,), dtype=np.float32)
+    detect_accident(_boxes, _areas, _boxes, _areas, 0.5, 1.5)
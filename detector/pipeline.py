@@ -1,10 +1,22 @@
 import os
 import csv
+import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
 import cv2
+import numpy as np
+import torch
+from ultralytics.data.augment import LetterBox
+from ultralytics.utils import ops
 
-from .model import load_model
+from . import iou_nb
+from .model import BATCH_N, IMGSZ, load_model, warmup
+
+logger = logging.getLogger(__name__)
 
 # ---------- SETUP OUTPUT FOLDERS ----------
 
@@ -13,30 +25,127 @@ os.makedirs("outputs/frames", exist_ok=True)
 
 # ---------- LOAD MODEL ONCE ----------
 
-model, DEVICE = load_model()
+# BACKEND is the raw AutoBackend (PyTorch / TensorRT / OpenVINO);
+# frames are preprocessed here instead of by the Ultralytics predictor
+BACKEND, DEVICE = load_model()
+NMS_IOU = 0.7  # same as Ultralytics' predict default
 VEHICLE_CLASSES = {"car", "motorbike", "bus", "truck"}
+# class names are resolved once here, never per detection
+# (YOLO.names is a property that rebuilds the dict on every access)
+CLASS_NAMES = BACKEND.names
+VEHICLE_CLASS_ID_SET = frozenset(
+    cls_id for cls_id, name in CLASS_NAMES.items() if name in VEHICLE_CLASSES
+)
+VEHICLE_CLASS_IDS = torch.tensor(sorted(VEHICLE_CLASS_ID_SET), device=DEVICE)
+PREFETCH = 8  # max decoded frames waiting for inference
+PROGRESS_EVERY = 50  # log progress once per this many source frames
+
+# live sources only need a few detections per second, at a smaller input size
+LIVE_FRAME_STRIDE = 2
+LIVE_IMGSZ = 416
+
+# (batch, 3, h, w) input shapes the backend has been warmed up for
+_warm_shapes = set()
+
+# snapshot JPEGs are encoded off the inference thread (cv2 releases the GIL)
+SNAPSHOT_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+_io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="snapshot-io")
+
+CSV_FIELDS = ["event_id", "frame", "time_seconds", "time_hhmmss", "snapshot_path"]
 
 
 # ---------- HELPER FUNCTIONS ----------
 
-def compute_iou(box1, box2):
+def box_areas(coords):
+    """
+    Areas of an (N, 4) array of [x1, y1, x2, y2] boxes.
+    """
+    return np.clip(coords[:, 2] - coords[:, 0], 0, None) * np.clip(
+        coords[:, 3] - coords[:, 1], 0, None
+    )
+
+
+def paired_iou(coords_a, coords_b, areas_a, areas_b):
     """
-    Compute IoU between two boxes [x1, y1, x2, y2].
+    IoU between matching rows of two (K, 4) arrays of [x1, y1, x2, y2] boxes.
     """
-    x1 = max(box1[0], box2[0])
-    y1 = max(box1[1], box2[1])
-    x2 = min(box1[2], box2[2])
-    y2 = min(box1[3], box2[3])
+    tl = np.maximum(coords_a[:, :2], coords_b[:, :2])
+    br = np.minimum(coords_a[:, 2:], coords_b[:, 2:])
+    inter = np.prod(np.clip(br - tl, 0, None), axis=1)
+    return inter / (areas_a + areas_b - inter + 1e-6)
+
+
+def detect_accident_vectorized(
+    curr_coords, curr_areas, prev_coords, prev_areas, iou_thres, growth_thres
+):
+    """
+    NumPy version of iou_nb.detect_accident, used when numba isn't installed.
+    """
+    # cheap prescreen: only (curr, prev) pairs whose boxes actually overlap
+    # and that grew enough can pass, so IoU is computed for those alone
+    candidates = (
+        (curr_coords[:, None, 2] > prev_coords[None, :, 0])
+        & (curr_coords[:, None, 0] < prev_coords[None, :, 2])
+        & (curr_coords[:, None, 3] > prev_coords[None, :, 1])
+        & (curr_coords[:, None, 1] < prev_coords[None, :, 3])
+        & (prev_areas[None, :] > 0)
+        & (curr_areas[:, None] >= growth_thres * (prev_areas[None, :] + 1e-6))
+    )
+    i, j = np.nonzero(candidates)
+    if i.size == 0:
+        return False
+
+    iou = paired_iou(curr_coords[i], prev_coords[j], curr_areas[i], prev_areas[j])
+    return bool((iou >= iou_thres).any())
+
+
+if iou_nb.NUMBA_AVAILABLE:
+    detect_accident = iou_nb.detect_accident
+else:
+    detect_accident = detect_accident_vectorized
 
-    inter_w = max(0, x2 - x1)
-    inter_h = max(0, y2 - y1)
-    inter_area = inter_w * inter_h
 
-    area1 = max(0, (box1[2] - box1[0])) * max(0, (box1[3] - box1[1]))
-    area2 = max(0, (box2[2] - box2[0])) * max(0, (box2[3] - box2[1]))
+def save_snapshot(snapshot_path, frame):
+    """
+    Encode frame as JPEG in memory and write the bytes out in one call.
+    Unlike cv2.imwrite this also works for non-ASCII paths on Windows
+    and raises on encode failures instead of silently returning False.
+    """
+    ok, jpg = cv2.imencode(".jpg", frame, SNAPSHOT_JPEG_PARAMS)
+    if not ok:
+        raise RuntimeError("JPEG encoding failed")
+    jpg.tofile(snapshot_path)
+
 
-    union_area = area1 + area2 - inter_area + 1e-6
-    return inter_area / union_area
+def write_finished_rows(pending, writer, csv_file, snapshot_paths, wait_all=False):
+    """
+    Write the CSV rows of accidents whose snapshot write has finished, in
+    event order, and add the saved snapshots to snapshot_paths.
+    pending is a deque of (future, row); wait_all blocks for all of them.
+    A failed write is logged and its row gets an empty snapshot_path.
+    """
+    written = False
+    while pending and (wait_all or pending[0][0].done()):
+        future, row = pending.popleft()
+        exc = future.exception()
+        if exc is None:
+            snapshot_paths.append(row["snapshot_path"])
+        else:
+            logger.warning("Could not save snapshot %s: %s", row["snapshot_path"], exc)
+            row["snapshot_path"] = ""
+        writer.writerow(row)
+        written = True
+    if written:
+        csv_file.flush()
+
+
+def draw_boxes(frame, coords):
+    """
+    Draw all [x1, y1, x2, y2] boxes with a single cv2.polylines call.
+    """
+    # corners (x1,y1) (x2,y1) (x2,y2) (x1,y2) of each box, shaped (N, 4, 1, 2)
+    corners = coords.astype(np.int32)[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 1, 2)
+    cv2.polylines(frame, list(corners), True, (0, 255, 0), 2)
 
 
 def draw_label(frame, text, x1, y1):
@@ -52,6 +161,267 @@ def draw_label(frame, text, x1, y1):
     )
 
 
+def open_capture(source):
+    """
+    Open a video file or stream URL with FFmpeg hardware decoding
+    (NVDEC / VAAPI / D3D11, whatever OpenCV finds) when available,
+    otherwise with OpenCV's default software decoder.
+    """
+    if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        cap = cv2.VideoCapture(
+            source,
+            cv2.CAP_FFMPEG,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+        )
+        if cap.isOpened():
+            return cap
+        cap.release()
+    return cv2.VideoCapture(source)
+
+
+def make_letterbox(imgsz):
+    """
+    Letterbox that scales frames to fit imgsz and pads them only up to the
+    next multiple of the model stride, e.g. 640x384 for 16:9 video instead
+    of a full 640x640 square (same as the Ultralytics predictor).
+    PyTorch and the dynamic TensorRT / OpenVINO exports all accept
+    rectangular inputs.
+    """
+    return LetterBox(new_shape=(imgsz, imgsz), auto=True, stride=int(BACKEND.stride))
+
+
+def make_input_buffers(shape):
+    """
+    Reusable buffers for one batch of letterboxed frames of shape (h, w):
+    a uint8 HWC host buffer (pinned on CUDA) the frames are written into,
+    and the float CHW tensor on DEVICE that is fed to the model
+    (FP16 when the backend runs in half precision).
+    The input buffer starts zeroed, since short batches are padded with
+    whatever rows it holds.
+    """
+    h, w = shape
+    host_buf = torch.empty((BATCH_N, h, w, 3), dtype=torch.uint8, pin_memory=DEVICE == "cuda")
+    dtype = torch.float16 if BACKEND.fp16 else torch.float32
+    input_buf = torch.zeros((BATCH_N, 3, h, w), dtype=dtype, device=DEVICE)
+    return host_buf, input_buf
+
+
+def warmup_once(shape):
+    """
+    Warm the backend up for a (batch, 3, h, w) input shape the first time
+    this process sees it, so cuDNN autotuning / TensorRT re-binding for a
+    new source's shape happens before its first real batch, once.
+    CPU backends have nothing to tune, so this is a no-op there.
+    """
+    if DEVICE == "cuda" and shape not in _warm_shapes:
+        warmup(BACKEND, shapes=(shape,))
+        _warm_shapes.add(shape)
+
+
+def warmup_for_stream(cap, imgsz):
+    """
+    Read one frame from a live stream and warm the backend up for its
+    letterboxed shape, before LatestFrameGrabber starts counting frames.
+    """
+    ret, frame = cap.read()
+    if ret:
+        h, w = make_letterbox(imgsz)(image=frame).shape[:2]
+        warmup_once((1, 3, h, w))
+
+
+def preprocess_batch(images, buffers, batch_size):
+    """
+    Write letterboxed BGR images (all the same shape) into a host buffer,
+    copy them to the device in one go and convert there
+    (BGR->RGB, HWC->CHW, /255) into the input buffer.
+    buffers caches make_input_buffers per letterboxed (h, w), so they are
+    sized from the first frame of a source and reused after that.
+    Returns the first batch_size rows of the input buffer: this batch,
+    padded with leftover rows so the model always sees one input shape.
+    """
+    shape = images[0].shape[:2]
+    if shape not in buffers:
+        buffers[shape] = make_input_buffers(shape)
+        warmup_once((batch_size, 3, *shape))
+    host_buf, input_buf = buffers[shape]
+
+    host = host_buf.numpy()
+    for i, image in enumerate(images):
+        host[i] = image
+
+    n = len(images)
+    batch_u8 = host_buf[:n].to(input_buf.device, non_blocking=True)
+    inputs = input_buf[:n]
+    inputs.copy_(batch_u8.permute(0, 3, 1, 2).flip(1))
+    inputs.div_(255.0)
+    return input_buf[:batch_size]
+
+
+def detect_vehicles(frames, conf_thres, letterbox, buffers, batch_size=BATCH_N):
+    """
+    Run YOLO on a batch of up to batch_size frames.
+    Returns one (coords, cls_ids) pair of numpy arrays per frame, vehicles only,
+    with coords as [x1, y1, x2, y2] in frame pixels.
+    """
+    images = [letterbox(image=frame) for frame in frames]
+
+    # a stream can change resolution mid-batch; run each same-shape run of
+    # frames separately (like the predictor's same_shapes check)
+    detections = []
+    start = 0
+    for end in range(1, len(images) + 1):
+        if end == len(images) or images[end].shape != images[start].shape:
+            detections += _detect_same_shape(
+                frames[start:end], images[start:end], conf_thres, buffers, batch_size
+            )
+            start = end
+    return detections
+
+
+def _detect_same_shape(frames, images, conf_thres, buffers, batch_size):
+    """
+    detect_vehicles for frames whose letterboxed images share one shape.
+    """
+    with torch.inference_mode():
+        inputs = preprocess_batch(images, buffers, batch_size)
+        preds = BACKEND(inputs)
+        if isinstance(preds, (list, tuple)):
+            preds = preds[0]  # PyTorch also returns raw head outputs
+        # drop the padding rows before NMS
+        dets = ops.non_max_suppression(preds[: len(frames)], conf_thres, NMS_IOU)
+
+        detections = []
+        for frame, det in zip(frames, dets):
+            # filter to vehicles on-device, then copy only those boxes
+            det = det[torch.isin(det[:, 5].long(), VEHICLE_CLASS_IDS)]
+            coords = ops.scale_boxes(inputs.shape[2:], det[:, :4], frame.shape)
+            # det[:, :4] is a strided view; on CPU .cpu() doesn't copy it, and
+            # non-contiguous input would make numba compile a new signature
+            coords = np.ascontiguousarray(coords.float().cpu().numpy())
+            detections.append((coords, det[:, 5].long().cpu().numpy()))
+    return detections
+
+
+class LatestFrameGrabber:
+    """
+    Keeps live streams real-time instead of letting OpenCV's buffer fall behind.
+
+    A background thread calls cap.grab() continuously to keep up with the
+    stream and only calls cap.retrieve() once frames() is asked for the next
+    frame; frames grabbed in between are dropped. grab() is not free: with
+    the FFmpeg backend (IP streams) it decodes the frame, and retrieve() only
+    converts colour / copies it out, so only that part is saved on dropped
+    frames. analyze_frames(live=True)
+    asks right before it runs inference, so detection gets the newest frame
+    rather than one that waited in a queue. All cap calls happen on that
+    one thread.
+    """
+
+    def __init__(self, cap, frame_stride=1):
+        self.cap = cap
+        self.frame_stride = frame_stride
+        self.wanted = threading.Event()
+        self.stopped = threading.Event()
+        self.slot = queue.Queue()
+        self.thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self.thread.start()
+
+    def _grab_loop(self):
+        seq = 0
+        try:
+            while not self.stopped.is_set():
+                if not self.cap.grab():
+                    logger.info("No more frames from stream.")
+                    break
+                seq += 1
+                # only decode frames detection would keep anyway
+                if seq % self.frame_stride != 0 or not self.wanted.is_set():
+                    continue
+                ret, frame = self.cap.retrieve()
+                if not ret:
+                    break
+                self.wanted.clear()
+                self.slot.put((seq, frame))
+        finally:
+            self.slot.put(None)
+
+    def frames(self):
+        """
+        Yield (frame_idx, frame) for the newest frame each time one is
+        requested; frame_idx counts every frame of the stream, dropped or not.
+        """
+        while True:
+            self.wanted.set()
+            item = self.slot.get()
+            if item is None:
+                return
+            yield item
+
+    def stop(self):
+        """Stop grabbing; call before cap.release()."""
+        self.stopped.set()
+        self.thread.join()
+
+
+def select_frames(frame_generator, max_frames=None, frame_stride=1):
+    """
+    Yield every frame_stride-th (frame_idx, frame) from frame_generator,
+    stopping after max_frames source frames and logging progress.
+    """
+    last_progress = 0
+    for frame_idx, frame in frame_generator:
+        if frame is None:
+            return
+
+        if max_frames is not None and frame_idx > max_frames:
+            logger.info("Reached max_frames=%s, stopping.", max_frames)
+            return
+
+        # frame_idx can skip values (dropped live frames), so compare
+        # progress buckets instead of testing frame_idx % PROGRESS_EVERY
+        progress = frame_idx // PROGRESS_EVERY
+        if progress != last_progress:
+            last_progress = progress
+            logger.info("Processing frame %s...", frame_idx)
+
+        if frame_idx % frame_stride != 0:
+            continue
+
+        yield frame_idx, frame
+
+
+def read_frames(frame_generator, read_q, stop_event, max_frames=None, frame_stride=1):
+    """
+    Reader thread: push the select_frames() items of frame_generator into
+    read_q, so decoding overlaps with inference. Always ends with None.
+    """
+    try:
+        for item in select_frames(frame_generator, max_frames, frame_stride):
+            if stop_event.is_set():
+                break
+            read_q.put(item)
+    finally:
+        read_q.put(None)
+
+
+def iter_batches(read_q, batch_size):
+    """
+    Group queued (frame_idx, frame) items into batches of batch_size for YOLO.
+    Waits for full batches so only the last one can be short.
+    """
+    batch = []
+    while True:
+        item = read_q.get()
+        if item is None:
+            break
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 # ---------- CORE ACCIDENT LOGIC ----------
 
 def analyze_frames(
@@ -62,136 +432,163 @@ def analyze_frames(
     accident_iou_thres,
     area_growth_factor,
     max_frames=None,
+    prefetch=PREFETCH,
+    frame_stride=1,
+    imgsz=IMGSZ,
+    batch_size=BATCH_N,
+    live=False,
 ):
     """
     Shared logic: run YOLO on frames, detect accidents, save JPG + CSV.
 
-    frame_generator: yields frames (numpy arrays)
+    Runs as three stages: a reader thread decodes frames, this thread runs
+    YOLO + the accident heuristic, and a small thread pool saves snapshots.
+    With live=True there is no reader thread: each frame is pulled from
+    frame_generator only when YOLO is about to run on it, one at a time,
+    so a grab-latest source (LatestFrameGrabber) hands over its newest frame.
+
+    frame_generator: yields (frame_idx, frame), frame_idx counting source
+                     frames from 1 (for timestamps)
     base_name: used for naming outputs
     fps: frames per second (for timestamps)
+    prefetch: max decoded frames waiting for inference
+    frame_stride: run detection on every n-th frame only
+    imgsz: YOLO input size, a multiple of 32
+           (smaller = faster, less accurate on small vehicles)
+    batch_size: frames per YOLO call, at most BATCH_N; a short last batch
+                is padded so every call uses the same input shape
+    live: real-time source (see above); prefetch and batch_size are ignored
 
     Returns: (snapshot_paths, csv_log_path)
     """
     log_csv_path = os.path.join("outputs", f"{base_name}_accident_log.csv")
+    time_per_frame = 1.0 / fps if fps > 0 else 1.0
 
-    prev_boxes = []
-    accident_events = []
+    prev_coords = np.empty((0, 4), dtype=np.float32)
+    prev_areas = np.empty((0,), dtype=np.float32)
     snapshot_paths = []
     accident_counter = 0
-    frame_idx = 0
-
-    for frame in frame_generator:
-        if frame is None:
-            break
-
-        frame_idx += 1
-        if max_frames is not None and frame_idx > max_frames:
-            print(f"[INFO] Reached max_frames={max_frames}, stopping.")
-            break
 
-        if frame_idx % 50 == 0:
-            print(f"[INFO] Processing frame {frame_idx}...")
-
-        # YOLO inference
-        results = model(frame, conf=conf_thres, device=DEVICE, verbose=False)[0]
-
-        curr_boxes = []
-        for box in results.boxes:
-            cls_id = int(box.cls[0])
-            label = model.names[cls_id]
-            if label not in VEHICLE_CLASSES:
-                continue
-
-            x1, y1, x2, y2 = box.xyxy[0].tolist()
-            area = max(0, x2 - x1) * max(0, y2 - y1)
-            curr_boxes.append({"coords": [x1, y1, x2, y2], "area": area, "label": label})
-
-        # Heuristic: big overlap + sudden area growth -> possible accident
-        accident_in_this_frame = False
-        for cb in curr_boxes:
-            for pb in prev_boxes:
-                iou = compute_iou(cb["coords"], pb["coords"])
-                if iou >= accident_iou_thres and pb["area"] > 0:
-                    growth = cb["area"] / (pb["area"] + 1e-6)
-                    if growth >= area_growth_factor:
-                        accident_in_this_frame = True
-                        break
-            if accident_in_this_frame:
-                break
-
-        # Draw boxes
-        for cb in curr_boxes:
-            x1, y1, x2, y2 = cb["coords"]
-            cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), (0, 255, 0), 2)
-            draw_label(frame, cb["label"], x1, y1)
-
-        # Save snapshot on accident
-        if accident_in_this_frame:
-            accident_counter += 1
-            ts = frame_idx / fps if fps > 0 else frame_idx
-            time_str = str(timedelta(seconds=int(ts)))
-
-            cv2.putText(
-                frame,
-                f"ACCIDENT DETECTED! #{accident_counter}",
-                (30, 40),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1.0,
-                (0, 0, 255),
-                3,
-                cv2.LINE_AA,
-            )
-
-            snapshot_path = os.path.join(
-                "outputs/frames",
-                f"{base_name}_accident_{accident_counter}_frame_{frame_idx}.jpg",
-            )
-            cv2.imwrite(snapshot_path, frame)
-            snapshot_paths.append(snapshot_path)
-
-            accident_events.append(
-                {
-                    "event_id": accident_counter,
-                    "frame": frame_idx,
-                    "time_seconds": round(ts, 2),
-                    "time_hhmmss": time_str,
-                    "snapshot_path": snapshot_path,
-                }
-            )
-
-        prev_boxes = curr_boxes
-
-    # CSV
-    if accident_events:
-        with open(log_csv_path, "w", newline="") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=[
-                    "event_id",
-                    "frame",
-                    "time_seconds",
-                    "time_hhmmss",
-                    "snapshot_path",
-                ],
-            )
-            writer.writeheader()
-            writer.writerows(accident_events)
+    letterbox = make_letterbox(imgsz)
+    buffers = {}  # allocated once the first frame's letterboxed shape is known
+
+    # rows are written as soon as each event's snapshot is saved, so the log
+    # can be tailed live, memory stays flat on long videos, and the CSV only
+    # names snapshots that exist
+    csv_file = open(log_csv_path, "w", newline="")
+    writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    csv_file.flush()
+
+    pending_writes = deque()  # (snapshot future, CSV row), in event order
+    stop_event = threading.Event()
+    if live:
+        batch_size = 1
+        reader = None
+        batches = (
+            [item] for item in select_frames(frame_generator, max_frames, frame_stride)
+        )
     else:
-        # write just header row when no accidents
-        with open(log_csv_path, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                ["event_id", "frame", "time_seconds", "time_hhmmss", "snapshot_path"]
+        read_q = queue.Queue(maxsize=prefetch)
+        reader = threading.Thread(
+            target=read_frames,
+            args=(frame_generator, read_q, stop_event, max_frames, frame_stride),
+            daemon=True,
+        )
+        reader.start()
+        batches = iter_batches(read_q, batch_size)
+
+    try:
+        for batch in batches:
+            # YOLO inference on the whole batch, then step through it in order
+            frames = [frame for _, frame in batch]
+            detections = detect_vehicles(
+                frames, conf_thres, letterbox, buffers, batch_size
             )
 
-    print("[INFO] CSV:", log_csv_path)
-    print("[INFO] Snapshots:", len(snapshot_paths))
+            for (frame_idx, frame), (curr_coords, cls_ids) in zip(batch, detections):
+                curr_areas = box_areas(curr_coords)
+                curr_labels = [CLASS_NAMES[c] for c in cls_ids.tolist()]
+
+                # Heuristic: big overlap + sudden area growth -> possible accident
+                accident_in_this_frame = detect_accident(
+                    curr_coords,
+                    curr_areas,
+                    prev_coords,
+                    prev_areas,
+                    accident_iou_thres,
+                    area_growth_factor,
+                )
+
+                # Draw boxes (all outlines in one call, labels one by one)
+                if len(curr_coords):
+                    draw_boxes(frame, curr_coords)
+                    for (x1, y1, _, _), label in zip(curr_coords, curr_labels):
+                        draw_label(frame, label, x1, y1)
+
+                # Save snapshot on accident
+                if accident_in_this_frame:
+                    accident_counter += 1
+                    ts = frame_idx * time_per_frame
+                    time_str = str(timedelta(seconds=int(ts)))
+
+                    cv2.putText(
+                        frame,
+                        f"ACCIDENT DETECTED! #{accident_counter}",
+                        (30, 40),
+                        cv2.FONT_HERSHEY_SIMPLEX,
+                        1.0,
+                        (0, 0, 255),
+                        3,
+                        cv2.LINE_AA,
+                    )
+
+                    snapshot_path = os.path.join(
+                        "outputs/frames",
+                        f"{base_name}_accident_{accident_counter}_frame_{frame_idx}.jpg",
+                    )
+                    # frame isn't touched again after this, so no copy is needed
+                    future = _io_pool.submit(save_snapshot, snapshot_path, frame)
+                    pending_writes.append(
+                        (
+                            future,
+                            {
+                                "event_id": accident_counter,
+                                "frame": frame_idx,
+                                "time_seconds": round(ts, 2),
+                                "time_hhmmss": time_str,
+                                "snapshot_path": snapshot_path,
+                            },
+                        )
+                    )
+
+                prev_coords, prev_areas = curr_coords, curr_areas
+
+            write_finished_rows(pending_writes, writer, csv_file, snapshot_paths)
+    finally:
+        # stop the reader (draining so it can't block on a full queue),
+        # then wait for pending snapshots so the gallery can load them
+        stop_event.set()
+        while reader is not None and reader.is_alive():
+            try:
+                read_q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        write_finished_rows(
+            pending_writes, writer, csv_file, snapshot_paths, wait_all=True
+        )
+        csv_file.close()
+
+    logger.info("CSV: %s", log_csv_path)
+    logger.info("Snapshots: %s", len(snapshot_paths))
     return snapshot_paths, log_csv_path
 
 
 # ---------- MODE 1: UPLOADED VIDEO ----------
 
-def process_uploaded_video(video_file, conf_thres, accident_iou, area_growth):
+def process_uploaded_video(
+    video_file, conf_thres, accident_iou, area_growth, frame_stride=1, imgsz=IMGSZ
+):
     """Entry for UI when user uploads a video."""
     if video_file is None:
         return [], None
@@ -200,20 +597,28 @@ def process_uploaded_video(video_file, conf_thres, accident_iou, area_growth):
     if not os.path.exists(video_path):
         return [], None
 
-    cap = cv2.VideoCapture(video_path)
+    cap = open_capture(video_path)
     if not cap.isOpened():
         return [], None
 
     fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
     base_name = os.path.splitext(os.path.basename(video_path))[0]
-    print(f"[UPLOAD] {video_path}, fps={fps:.1f}")
+    logger.info("[UPLOAD] %s, fps=%.1f", video_path, fps)
 
     def frame_gen():
+        frame_idx = 0
         while True:
+            frame_idx += 1
+            # frames detection will skip are only grabbed: no colour
+            # conversion or copy into a new numpy frame
+            if frame_idx % frame_stride != 0:
+                if not cap.grab():
+                    break
+                continue
             ret, frame = cap.read()
             if not ret:
                 break
-            yield frame
+            yield frame_idx, frame
 
     snapshots, csv_log = analyze_frames(
         frame_generator=frame_gen(),
@@ -223,6 +628,8 @@ def process_uploaded_video(video_file, conf_thres, accident_iou, area_growth):
         accident_iou_thres=accident_iou,
         area_growth_factor=area_growth,
         max_frames=None,
+        frame_stride=frame_stride,
+        imgsz=imgsz,
     )
 
     cap.release()
@@ -231,46 +638,70 @@ def process_uploaded_video(video_file, conf_thres, accident_iou, area_growth):
 
 # ---------- MODE 2: LAPTOP WEBCAM ----------
 
-def process_webcam(duration_sec, conf_thres, accident_iou, area_growth):
+def process_webcam(
+    duration_sec,
+    conf_thres,
+    accident_iou,
+    area_growth,
+    frame_stride=LIVE_FRAME_STRIDE,
+    imgsz=LIVE_IMGSZ,
+):
     """Entry for UI when user selects laptop webcam."""
     cap = cv2.VideoCapture(0)
     if not cap.isOpened():
         raise RuntimeError("Could not open laptop webcam (index 0).")
 
+    # tiny driver buffer, and MJPG at 640x480 so the camera doesn't send raw
+    # YUYV that has to be converted (and later downscaled) on the CPU
+    for prop, value in (
+        (cv2.CAP_PROP_BUFFERSIZE, 1),
+        (cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG")),
+        (cv2.CAP_PROP_FRAME_WIDTH, 640),
+        (cv2.CAP_PROP_FRAME_HEIGHT, 480),
+    ):
+        if not cap.set(prop, value):
+            logger.warning("[WEBCAM] Camera backend ignored capture property %s", prop)
+
     fps = cap.get(cv2.CAP_PROP_FPS)
     if fps <= 0 or fps > 120:
         fps = 15.0
-    print(f"[WEBCAM] Using FPS={fps:.1f}")
+    logger.info("[WEBCAM] Using FPS=%.1f", fps)
 
     base_name = "laptop_webcam"
     max_frames = int(fps * duration_sec)
 
-    def frame_gen():
-        count = 0
-        while count < max_frames:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            count += 1
-            yield frame
-
-    snapshots, csv_log = analyze_frames(
-        frame_generator=frame_gen(),
-        base_name=base_name,
-        fps=fps,
-        conf_thres=conf_thres,
-        accident_iou_thres=accident_iou,
-        area_growth_factor=area_growth,
-        max_frames=max_frames,
-    )
-
-    cap.release()
+    warmup_for_stream(cap, imgsz)
+    grabber = LatestFrameGrabber(cap, frame_stride)
+    try:
+        snapshots, csv_log = analyze_frames(
+            frame_generator=grabber.frames(),
+            base_name=base_name,
+            fps=fps,
+            conf_thres=conf_thres,
+            accident_iou_thres=accident_iou,
+            area_growth_factor=area_growth,
+            max_frames=max_frames,
+            frame_stride=frame_stride,
+            imgsz=imgsz,
+            live=True,
+        )
+    finally:
+        grabber.stop()
+        cap.release()
     return snapshots, csv_log
 
 
 # ---------- MODE 3: PHONE IP WEBCAM (URL) ----------
 
-def process_phone_ip_cam(ip_url, duration_sec, conf_thres, accident_iou, area_growth):
+def process_phone_ip_cam(
+    ip_url,
+    duration_sec,
+    conf_thres,
+    accident_iou,
+    area_growth,
+    frame_stride=LIVE_FRAME_STRIDE,
+    imgsz=LIVE_IMGSZ,
+):
     """
     Use phone camera via IP Webcam (or similar) app.
 
@@ -280,8 +711,8 @@ def process_phone_ip_cam(ip_url, duration_sec, conf_thres, accident_iou, area_gr
     if not ip_url:
         return [], None
 
-    print(f"[PHONE IP CAM] Opening stream: {ip_url}")
-    cap = cv2.VideoCapture(ip_url)
+    logger.info("[PHONE IP CAM] Opening stream: %s", ip_url)
+    cap = open_capture(ip_url)
     if not cap.isOpened():
         raise RuntimeError(
             f"Could not open IP camera stream: {ip_url}\n"
@@ -291,33 +722,33 @@ def process_phone_ip_cam(ip_url, duration_sec, conf_thres, accident_iou, area_gr
             "  - IP Webcam (or similar app) is running."
         )
 
+    if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+        logger.warning("[PHONE IP CAM] Stream backend ignored CAP_PROP_BUFFERSIZE")
+
     fps = cap.get(cv2.CAP_PROP_FPS)
     if fps <= 0 or fps > 120:
         fps = 15.0
-    print(f"[PHONE IP CAM] Using FPS={fps:.1f}")
+    logger.info("[PHONE IP CAM] Using FPS=%.1f", fps)
 
     base_name = "phone_ip_cam"
     max_frames = int(fps * duration_sec)
 
-    def frame_gen():
-        count = 0
-        while count < max_frames:
-            ret, frame = cap.read()
-            if not ret:
-                print("[PHONE IP CAM] No more frames from stream.")
-                break
-            count += 1
-            yield frame
-
-    snapshots, csv_log = analyze_frames(
-        frame_generator=frame_gen(),
-        base_name=base_name,
-        fps=fps,
-        conf_thres=conf_thres,
-        accident_iou_thres=accident_iou,
-        area_growth_factor=area_growth,
-        max_frames=max_frames,
-    )
-
-    cap.release()
+    warmup_for_stream(cap, imgsz)
+    grabber = LatestFrameGrabber(cap, frame_stride)
+    try:
+        snapshots, csv_log = analyze_frames(
+            frame_generator=grabber.frames(),
+            base_name=base_name,
+            fps=fps,
+            conf_thres=conf_thres,
+            accident_iou_thres=accident_iou,
+            area_growth_factor=area_growth,
+            max_frames=max_frames,
+            frame_stride=frame_stride,
+            imgsz=imgsz,
+            live=True,
+        )
+    finally:
+        grabber.stop()
+        cap.release()
     return snapshots, csv_log
@@ -4,20 +4,26 @@ from gradio_client import utils as gc_utils  # needed for the patch
 # ---- PATCH: fix 'argument of type bool is not iterable' bug in gradio_client ----
 # Some gradio versions pass a plain bool into get_type(), which crashes.
 # We wrap it so bools are handled safely instead of raising TypeError.
+# The marker on the wrapper keeps a module reload from wrapping it twice.
 
-_original_get_type = gc_utils.get_type
+if not getattr(gc_utils.get_type, "_handles_bool", False):
+    _original_get_type = gc_utils.get_type
 
-def _safe_get_type(schema):
-    if isinstance(schema, bool):
-        # Treat boolean schema objects as a simple "boolean" type
-        return "boolean"
-    return _original_get_type(schema)
+    def _safe_get_type(schema):
+        if isinstance(schema, bool):
+            # Treat boolean schema objects as a simple "boolean" type
+            return "boolean"
+        return _original_get_type(schema)
 
-gc_utils.get_type = _safe_get_type
+    _safe_get_type._handles_bool = True
+    gc_utils.get_type = _safe_get_type
 # ---- END PATCH -------------------------------------------------------------------
 
 
+from detector.model import IMGSZ
 from detector.pipeline import (
+    LIVE_FRAME_STRIDE,
+    LIVE_IMGSZ,
     process_uploaded_video,
     process_webcam,
     process_phone_ip_cam,
@@ -33,23 +39,48 @@ def gradio_main(
     conf_thres,
     accident_iou,
     area_growth,
+    frame_stride,
+    imgsz,
 ):
     """
     Router function called by Gradio when user clicks 'Run Detection'.
     Chooses which pipeline function to call based on source_type.
     """
+    frame_stride = int(frame_stride)
+    imgsz = int(imgsz)
+
     if source_type == "Upload video":
-        return process_uploaded_video(video_file, conf_thres, accident_iou, area_growth)
+        return process_uploaded_video(
+            video_file, conf_thres, accident_iou, area_growth, frame_stride, imgsz
+        )
 
     elif source_type == "Laptop webcam":
-        return process_webcam(webcam_duration, conf_thres, accident_iou, area_growth)
+        return process_webcam(
+            webcam_duration, conf_thres, accident_iou, area_growth, frame_stride, imgsz
+        )
 
     else:  # "Phone IP webcam (URL)"
         return process_phone_ip_cam(
-            phone_ip_url, phone_duration, conf_thres, accident_iou, area_growth
+            phone_ip_url,
+            phone_duration,
+            conf_thres,
+            accident_iou,
+            area_growth,
+            frame_stride,
+            imgsz,
         )
 
 
+def speed_defaults(source_type):
+    """
+    Reset the speed sliders when the source changes:
+    full rate for uploads, lighter settings for live cameras.
+    """
+    if source_type == "Upload video":
+        return gr.update(value=1), gr.update(value=IMGSZ)
+    return gr.update(value=LIVE_FRAME_STRIDE), gr.update(value=LIVE_IMGSZ)
+
+
 def create_app():
     """
     Build and return the Gradio Blocks UI.
@@ -130,6 +161,24 @@ def create_app():
                         info="How much bigger the bounding box must get between frames to flag an accident.",
                     )
 
+                    stride_slider = gr.Slider(
+                        minimum=1,
+                        maximum=5,
+                        value=1,
+                        step=1,
+                        label="Frame stride",
+                        info="Run detection on every n-th frame. Higher = faster.",
+                    )
+
+                    imgsz_slider = gr.Slider(
+                        minimum=320,
+                        maximum=IMGSZ,
+                        value=IMGSZ,
+                        step=32,
+                        label="Inference image size",
+                        info="Smaller = faster, but may miss small or distant vehicles.",
+                    )
+
                     run_btn = gr.Button("🚀 Run Detection", variant="primary")
 
                 # ---------------- RIGHT COLUMN: OUTPUTS ----------------
@@ -143,6 +192,12 @@ def create_app():
                     )
                     csv_output = gr.File(label="Accident Log CSV")
 
+            source_type.change(
+                fn=speed_defaults,
+                inputs=source_type,
+                outputs=[stride_slider, imgsz_slider],
+            )
+
             # Click handler
             run_btn.click(
                 fn=gradio_main,
@@ -155,6 +210,8 @@ def create_app():
                     conf_slider,
                     iou_slider,
                     growth_slider,
+                    stride_slider,
+                    imgsz_slider,
                 ],
                 outputs=[gallery_output, csv_output],
             )